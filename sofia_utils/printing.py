@@ -3,7 +3,11 @@
 Utilities for printing and formatting string
 """
 
-from re import match
+import re
+from collections.abc import ( Callable,
+                              Iterable )
+from string import ( ascii_letters,
+                     digits )
 from typing import Any
 
 
@@ -16,6 +20,21 @@ MAX_RECURSION_DEPTH = 10
 MIN_B64_IMG_ENCONDING_LENGTH = 2000
 """ Minimum Base64 image encoding length. Strings of this length or longer will be suspected to being Base64 image encondings. """
 
+_B64_DATA_URI_REGEX = re.compile(r'data:image/[a-z]+;base64,[A-Za-z0-9+/=]+$')
+""" Base64 image encoding wrapped in a data URI """
+_B64_RAW_REGEX = re.compile(r'[A-Za-z0-9+/=]+$')
+""" Bare Base64 encoding """
+_B64_CHARS = frozenset( ascii_letters + digits + '+/=' )
+""" Base64 alphabet (including padding) """
+_B64_HEAD_LENGTH = 64
+""" Number of leading characters screened before running a Base64 regex """
+_NUM_CACHED_PREFIXES = 32
+""" Number of indentation levels with precomputed prefixes """
+_SPACE_PREFIXES = tuple( ' ' * INDENT_SPACES * i for i in range(_NUM_CACHED_PREFIXES) )
+""" Precomputed indentation prefixes for `spaces` mode """
+_TAB_PREFIXES = tuple( '\t' * i for i in range(_NUM_CACHED_PREFIXES) )
+""" Precomputed indentation prefixes for `tabs` mode """
+
 
 def print_ind( argument     : str,
                indent_level : int = 0,
@@ -65,21 +84,23 @@ def str_ind( argument     : str,
         Indented string
     """
     
-    space = None
+    cached = 0 <= indent_level < _NUM_CACHED_PREFIXES
+    space  = None
     match indent_type :
         case 'spaces' :
-            space = ' ' * INDENT_SPACES * indent_level
+            space = _SPACE_PREFIXES[indent_level] if cached \
+                    else ' ' * INDENT_SPACES * indent_level
         case 'tabs' :
-            space = '\t' * indent_level
+            space = _TAB_PREFIXES[indent_level] if cached \
+                    else '\t' * indent_level
         case _ :
             raise ValueError(f"In str_ind: Invalid ind_type '{indent_type}'")
     
-    lines  = str(argument).split('\n')
-    result = []
-    for line in lines :
-        result.append(f'{space}{line}')
+    text = str(argument)
+    if not space :
+        return text
     
-    return '\n'.join(result)
+    return space + text.replace( '\n', '\n' + space)
 
 def str_recursively( data         : Any,
                      indent_level : int = 0,
@@ -100,150 +121,273 @@ def str_recursively( data         : Any,
     if _visited is None :
         _visited = set()
     
+    # Collect every line into one flat list and join only once at the end
+    result = []
+    _str_recursively_into( result, data, indent_level, indent_type, _visited)
+    
+    return '\n'.join(result)
+
+def _str_recursively_into( result       : list[str],
+                           data         : Any,
+                           indent_level : int,
+                           indent_type  : str,
+                           _visited     : set ) -> None :
+    """
+    Append string representation of object to list of lines, recursively parsing contents. \\
+    Args:
+        result       : List of (already indented) lines to append to
+        data         : Input object
+        indent_level : Indentation level. Each level is `INDENT_SPACES` spaces or one tab.
+        indent_type  : Indentation type: `spaces` | `tabs`
+        _visited     : Set of ids of objects currently being parsed
+    """
+    
+    # Exact types resolve with a single lookup; subclasses fall back to isinstance checks
+    handler = _HANDLERS.get(type(data))
+    if handler is None :
+        handler = _get_handler(data)
+    
+    # Leaves cannot introduce circular references, so skip the visited set
+    if handler in _LEAF_HANDLERS :
+        handler( result, data, indent_level, indent_type)
+        return
+    
     # Check for circular references
     data_id = id(data)
     if data_id in _visited :
         msg = f"<circular reference to {type(data).__name__}>"
-        return str_ind( msg, indent_level, indent_type)
+        result.append( str_ind( msg, indent_level, indent_type) )
+        return
     
-    # Add current object to visited set
+    # Add current container to visited set while parsing its contents
     _visited.add(data_id)
-    
-    # None
-    if data is None :
+    try :
+        # Handlers only open the container; recursing here keeps one frame per level
+        opened = handler( result, data, indent_level, indent_type)
+        if opened is not None :
+            members, closing = opened
+            for label, member in members :
+                result.append( str_ind( label, indent_level, indent_type) )
+                _str_recursively_into( result, member,
+                                       indent_level + 1, indent_type, _visited)
+            result.append( str_ind( closing, indent_level, indent_type) )
+    finally :
         _visited.remove(data_id)
-        return str_ind( "None", indent_level, indent_type)
-    
-    # Raw binary data (bytes)
-    elif isinstance( data, bytes):
-        display_len = min( 4, len(data))
-        shown       = data[:display_len]
-        shown_str   = ' '.join( f'{b:02x}' for b in shown )
-        
-        if len(data) > 4 :
-            shown_str += ' ...'
-        
-        _visited.remove(data_id)
-        return str_ind( f"bytes: {shown_str}", indent_level, indent_type)
     
-    # Strings
+    return
+
+def _get_handler( data : Any) -> Callable :
+    """
+    Get the handler for an object whose exact type is not in `_HANDLERS` \\
+    Args:
+        data : Input object
+    Returns:
+        Function that appends the object's string representation to a list of lines
+    """
+    if data is None :
+        return _append_none
+    elif isinstance( data, bytes) :
+        return _append_bytes
     elif isinstance( data, str) :
+        return _append_str
+    elif isinstance( data, int) or isinstance( data, float) :
+        return _append_number
+    elif isinstance( data, list) or isinstance( data, tuple) :
+        return _open_sequence
+    elif isinstance( data, dict) :
+        return _open_dict
+    elif isinstance( data, type) :
+        return _append_type
+    elif hasattr( data, "__class__") and hasattr( data.__class__, "__name__") :
+        return _open_object
+    return _append_fallback
 
-        # Check for Base64 image encoding
-        if len(data) >= MIN_B64_IMG_ENCONDING_LENGTH :
-            b64_chars = "A-Za-z0-9+/="
-            if match( fr'data:image/[a-z]+;base64,[{b64_chars}]+$', data) \
-            or match( fr'[{b64_chars}]+$', data) :
-                _visited.remove(data_id)
-                return str_ind( "str: [Base64 Image Enconding]", indent_level, indent_type)
-        
-        _visited.remove(data_id)
-        return str_ind( f"str: {data}", indent_level, indent_type)
+def _append_none( result       : list[str],
+                  data         : None,
+                  indent_level : int,
+                  indent_type  : str ) -> None :
+    """
+    Append string representation of None
+    """
+    result.append( str_ind( "None", indent_level, indent_type) )
+    return
+
+def _append_bytes( result       : list[str],
+                   data         : bytes,
+                   indent_level : int,
+                   indent_type  : str ) -> None :
+    """
+    Append string representation of raw binary data (first four bytes in hex)
+    """
+    display_len = min( 4, len(data))
+    shown       = data[:display_len]
+    shown_str   = ' '.join( f'{b:02x}' for b in shown )
     
-    # Numbers
-    elif isinstance( data, int) or isinstance( data, float) :
-        data_t = data.__class__.__name__
-        _visited.remove(data_id)
-        return str_ind( f"{data_t}: {str(data)}", indent_level, indent_type)
+    if len(data) > 4 :
+        shown_str += ' ...'
     
-    # Lists and tuples
-    elif isinstance( data, list) or isinstance( data, tuple) :
-        
-        title  = "list:" if isinstance( data, list) else "tuple:"
-        border = '[]' if isinstance( data, list) else '()'
-        
-        if not data :
-            _visited.remove(data_id)
-            return str_ind( f"{title} {border}", indent_level, indent_type)
-        
-        result = []
-        result.append( str_ind( title,     indent_level, indent_type) )
-        result.append( str_ind( border[0], indent_level, indent_type) )
-        
-        for item in data :
-            result.append( str_ind( '[>] item:',  indent_level,     indent_type) )
-            result.append( str_recursively( item, indent_level + 1, indent_type, _visited) )
-        
-        result.append( str_ind( border[1], indent_level, indent_type) )
-        
-        _visited.remove(data_id)
-        return '\n'.join(result)
+    result.append( str_ind( f"bytes: {shown_str}", indent_level, indent_type) )
+    return
+
+def _append_str( result       : list[str],
+                 data         : str,
+                 indent_level : int,
+                 indent_type  : str ) -> None :
+    """
+    Append string representation of string, masking suspected Base64 image encodings
+    """
+    is_b64_img = None
     
-    # Dictionaries
-    elif isinstance( data, dict) :
-        
-        if not data :
-            _visited.remove(data_id)
-            return str_ind( "dict: {}", indent_level, indent_type)
-        
-        result = []
-        result.append( str_ind( 'dict:', indent_level, indent_type) )
-        result.append( str_ind( '{',     indent_level, indent_type) )
-        
-        for key, val in data.items() :
-            result.append( str_ind( f'[>] {key}:',
-                           indent_level,     indent_type) )
-            result.append( str_recursively( val,
-                           indent_level + 1, indent_type, _visited) )
-        
-        result.append( str_ind( '}', indent_level, indent_type) )
-        
-        _visited.remove(data_id)
-        return '\n'.join(result)
+    # Check for Base64 image encoding
+    if len(data) >= MIN_B64_IMG_ENCONDING_LENGTH :
+        # Screen the head of the string before scanning all of it
+        if data.startswith('data:image/') :
+            is_b64_img = _B64_DATA_URI_REGEX.match(data)
+        elif _B64_CHARS.issuperset(data[:_B64_HEAD_LENGTH]) :
+            is_b64_img = _B64_RAW_REGEX.match(data)
     
-    # Types
-    elif isinstance( data, type) :
-        _visited.remove(data_id)
-        return str_ind( f"definition of class '{data.__name__}'", indent_level, indent_type)
+    if is_b64_img :
+        result.append( str_ind( "str: [Base64 Image Enconding]", indent_level, indent_type) )
+    else :
+        result.append( str_ind( f"str: {data}", indent_level, indent_type) )
+    return
+
+def _append_number( result       : list[str],
+                    data         : int | float,
+                    indent_level : int,
+                    indent_type  : str ) -> None :
+    """
+    Append string representation of number
+    """
+    data_t = data.__class__.__name__
+    result.append( str_ind( f"{data_t}: {str(data)}", indent_level, indent_type) )
+    return
+
+def _append_type( result       : list[str],
+                  data         : type,
+                  indent_level : int,
+                  indent_type  : str ) -> None :
+    """
+    Append string representation of class definition
+    """
+    result.append( str_ind( f"definition of class '{data.__name__}'", indent_level, indent_type) )
+    return
+
+def _append_fallback( result       : list[str],
+                      data         : Any,
+                      indent_level : int,
+                      indent_type  : str ) -> None :
+    """
+    Append string representation of object of unknown kind
+    """
+    result.append( str_ind( f"object of type {type(data)}", indent_level, indent_type) )
+    return
+
+def _open_sequence( result       : list[str],
+                    data         : list | tuple,
+                    indent_level : int,
+                    indent_type  : str
+                  ) -> tuple[ Iterable[ tuple[ str, Any] ], str] | None :
+    """
+    Append opening lines of list or tuple \\
+    Returns:
+        If not empty then (label, item) pairs to parse and closing line; else None.
+    """
+    title  = "list:" if isinstance( data, list) else "tuple:"
+    border = '[]' if isinstance( data, list) else '()'
     
-    # Objects
-    elif hasattr( data, "__class__") and hasattr( data.__class__, "__name__") :
-        
-        result  = []
-        data_t  = data.__class__.__name__
-        msg_str = f"object of class '{data_t}'"
-        result.append( str_ind( msg_str, indent_level, indent_type) )
-
-        # Prevent infinite recursion
-        if indent_level > MAX_RECURSION_DEPTH :
-            result.append( str_ind( f"<max depth reached>", indent_level + 1, indent_type) )
-            _visited.remove(data_id)
-            return '\n'.join(result)
-
-        if hasattr( data, "__dict__") or hasattr( data, "__slots__") :
-            
-            attrs = {}
-            if hasattr( data, "__dict__") :
-                attrs = data.__dict__
-            else :
-                slots = getattr( data, "__slots__")
-                if isinstance( slots, str) :
-                    slots = [slots]
-                for slot_ in slots :
-                    if hasattr( data, slot_) :
-                        attrs[slot_] = getattr( data, slot_)
-            
-            # Filter out internal/private attributes
-            filtered_attrs = {}
-            for att, val in attrs.items() :
-                if not ( att.startswith( '_' ) or att.startswith( '__' ) ) :
-                    filtered_attrs[att] = val
-            
-            if filtered_attrs :
-                
-                result.append( str_ind( '{', indent_level, indent_type) )
-                
-                for att, val in filtered_attrs.items() :
-                    result.append( str_ind( f"[>] {att}:",
-                                   indent_level,     indent_type) )
-                    result.append( str_recursively( val,
-                                   indent_level + 1, indent_type, _visited) )
-                
-                result.append( str_ind( '}', indent_level, indent_type) )
-        
-        _visited.remove(data_id)
-        return '\n'.join(result)
+    if not data :
+        result.append( str_ind( f"{title} {border}", indent_level, indent_type) )
+        return None
+    
+    result.append( str_ind( title,     indent_level, indent_type) )
+    result.append( str_ind( border[0], indent_level, indent_type) )
+    
+    return ( ( '[>] item:', item) for item in data ), border[1]
+
+def _open_dict( result       : list[str],
+                data         : dict,
+                indent_level : int,
+                indent_type  : str
+              ) -> tuple[ Iterable[ tuple[ str, Any] ], str] | None :
+    """
+    Append opening lines of dict \\
+    Returns:
+        If not empty then (label, value) pairs to parse and closing line; else None.
+    """
+    if not data :
+        result.append( str_ind( "dict: {}", indent_level, indent_type) )
+        return None
+    
+    result.append( str_ind( 'dict:', indent_level, indent_type) )
+    result.append( str_ind( '{',     indent_level, indent_type) )
+    
+    return ( ( f'[>] {key}:', val) for key, val in data.items() ), '}'
+
+def _open_object( result       : list[str],
+                  data         : Any,
+                  indent_level : int,
+                  indent_type  : str
+                ) -> tuple[ Iterable[ tuple[ str, Any] ], str] | None :
+    """
+    Append opening lines of object \\
+    Returns:
+        If it has public attributes then (label, value) pairs to parse and closing line; else None.
+    """
+    data_t  = data.__class__.__name__
+    msg_str = f"object of class '{data_t}'"
+    result.append( str_ind( msg_str, indent_level, indent_type) )
+    
+    # Prevent infinite recursion
+    if indent_level > MAX_RECURSION_DEPTH :
+        result.append( str_ind( f"<max depth reached>", indent_level + 1, indent_type) )
+        return None
+    
+    if not ( hasattr( data, "__dict__") or hasattr( data, "__slots__") ) :
+        return None
+    
+    attrs = {}
+    if hasattr( data, "__dict__") :
+        attrs = data.__dict__
+    else :
+        slots = getattr( data, "__slots__")
+        if isinstance( slots, str) :
+            slots = [slots]
+        for slot_ in slots :
+            if hasattr( data, slot_) :
+                attrs[slot_] = getattr( data, slot_)
     
-    # Fallback
-    _visited.remove(data_id)
-    return str_ind( f"object of type {type(data)}", indent_level, indent_type)
+    # Filter out internal/private attributes
+    filtered_attrs = {}
+    for att, val in attrs.items() :
+        if not ( att.startswith( '_' ) or att.startswith( '__' ) ) :
+            filtered_attrs[att] = val
+    
+    if not filtered_attrs :
+        return None
+    
+    result.append( str_ind( '{', indent_level, indent_type) )
+    
+    return ( ( f"[>] {att}:", val) for att, val in filtered_attrs.items() ), '}'
+
+
+_HANDLERS : dict[ type, Callable] = {
+    type(None) : _append_none,
+    bytes      : _append_bytes,
+    str        : _append_str,
+    bool       : _append_number,
+    int        : _append_number,
+    float      : _append_number,
+    list       : _open_sequence,
+    tuple      : _open_sequence,
+    dict       : _open_dict,
+    type       : _append_type,
+}
+""" Handlers of `str_recursively`, indexed by exact type """
+_LEAF_HANDLERS = frozenset({ _append_none,
+                             _append_bytes,
+                             _append_str,
+                             _append_number,
+                             _append_type,
+                             _append_fallback })
+""" Handlers of objects that have no contents to parse recursively """
@@ -6,11 +6,21 @@ from datetime import ( datetime,
                        timezone,
                        timedelta )
 from hashlib import sha256
+from os import urandom
 from random import ( choices,
                      randrange )
 from string import ascii_letters
 from string import digits
-from uuid import uuid4
+
+
+_B62_ALPHABET = tuple( ascii_letters + digits )
+""" Base62 alphabet: ASCII letters and digits """
+_B62_TABLE = bytes( ord(_B62_ALPHABET[ i % 62 ]) for i in range(256) )
+""" Byte translation table mapping random bytes onto the Base62 alphabet """
+_B62_REJECT = bytes( range( 248, 256) )
+""" Random bytes discarded to avoid modulo bias (248 = 4 * 62) """
+_DIGITS = tuple(digits)
+""" Decimal digits """
 
 
 def generate_B62ID( length : int) -> str :
@@ -21,7 +31,10 @@ def generate_B62ID( length : int) -> str :
     Returns:
         Random string of ASCII letters and digits
     """
-    return "".join( choices( list( ascii_letters + digits ), k = length) )
+    result = b""
+    while len(result) < length :
+        result += urandom(length).translate( _B62_TABLE, _B62_REJECT)
+    return result[:length].decode("ascii")
 
 def generate_number( length : int) -> str :
     """
@@ -31,7 +44,7 @@ def generate_number( length : int) -> str :
     Returns:
         Random sequence of digits (including, possibly, leading zeros).
     """
-    return "".join( choices( list(digits), k = length) )
+    return "".join( choices( _DIGITS, k = length) )
 
 def generate_rand_date( start_date : str | None = None,
                         end_date   : str | None = None ) -> str:
@@ -75,7 +88,13 @@ def generate_UUID() -> str :
     Returns:
         'xxxxxxxx-xxxx-4xxx-Nxxx-xxxxxxxxxxxx' where N in ( 8, 9, a, b)
     """
-    return str(uuid4())
+    # Set the version (4) and variant (RFC 4122) bits by hand to skip the
+    # argument checks and field bookkeeping of the uuid.UUID constructor
+    b    = bytearray(urandom(16))
+    b[6] = ( b[6] & 0x0F ) | 0x40
+    b[8] = ( b[8] & 0x3F ) | 0x80
+    h    = b.hex()
+    return f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}"
 
 def get_now_utc_iso() -> str :
     """
@@ -99,9 +118,7 @@ def get_sha256( data : bytes) -> str :
     Returns:
         SHA-256 hash of the object's binary content
     """
-    h = sha256()
-    h.update(data)
-    return h.hexdigest()
+    return sha256(data).hexdigest()
 
 def unix_to_utc_iso( epoch : int | float | str | None) -> str | None :
     """
@@ -135,8 +152,7 @@ def utc_iso_to_dt( timestamp : str | None) -> datetime | None :
     """
     if timestamp :
         try :
-            if timestamp.endswith("Z") :
-                timestamp = timestamp.replace( "Z", "+00:00")
+            # Python 3.11+ parses the 'Z' suffix natively
             return datetime.fromisoformat(timestamp)
         
         except Exception as ex :